@@ -20,7 +20,6 @@ karuk.draw_paradigm()
 
 print('Negative')
 
-karuk.rules.extend([
-    GenRule(['Acc', '+2'], [['Nom', '-1'], ['-3', '+pl']]),
-    GenRule(['Acc', '+2'], [['Nom', '+3']])])
+karuk.add_rule(GenRule(['Acc', '+2'], [['Nom', '-1'], ['-3', '+pl']]))
+karuk.add_rule(GenRule(['Acc', '+2'], [['Nom', '+3']]))
 karuk.draw_paradigm()
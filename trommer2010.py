@@ -11,29 +11,55 @@ Generalisation of Morphemes.
 """
 
 
-from copy import deepcopy
+from functools import lru_cache
 
 __all__ = ['VI', 'GenRule', 'Language', 'parse_features']
 
 
+CASES = ('Nom', 'Acc', 'Erg', 'Abs')
+"""Case features; every argument of a paradigm cell bears exactly one."""
+
+FEATURES = CASES + ('+1', '-1', '+2', '-2', '+3', '-3',
+                    '+sg', '-sg', '+pl', '-pl', '+intr', '-intr')
+"""All morpho-syntactic features known to the theory."""
+
+FEATURE_BITS = {feature: 1 << i for i, feature in enumerate(FEATURES)}
+"""Mapping from feature names to the bit used for them in feature masks."""
+
+NOM = FEATURE_BITS['Nom']
+ACC = FEATURE_BITS['Acc']
+ERG = FEATURE_BITS['Erg']
+ABS = FEATURE_BITS['Abs']
+
+CASE_MASK = NOM | ACC | ERG | ABS
+"""Feature mask containing all case features."""
+
+# speech act participants of each person: bit 0 for the speaker, bit 1 for
+# the hearer (which the inclusive includes)
+PERSON_MASKS = {'1': 1, '1i': 3, '2': 2, '3': 0}
+
+
 def value(boolean):
     """Return binary feature value."""
     return '+' if boolean else '-'
 
 
+@lru_cache(maxsize=None)
 def feature_structure(string, case, intr=False):
     """Convert person-number string to a single feature structure.
 
+    The result is a tuple, so it can be cached and shared safely.
+
     Examples:
 
     >>> feature_structure('1s', 'Nom', True)
-    ['Nom', '+1', '-2', '-3', '+sg', '-pl', '+intr']
+    ('Nom', '+1', '-2', '-3', '+sg', '-pl', '+intr')
     >>> feature_structure('2p', 'Abs', True)
-    ['Abs', '-1', '+2', '-3', '-sg', '+pl', '+intr']
+    ('Abs', '-1', '+2', '-3', '-sg', '+pl', '+intr')
     >>> feature_structure('3d', 'Erg')
-    ['Erg', '-1', '-2', '+3', '-sg', '-pl']
+    ('Erg', '-1', '-2', '+3', '-sg', '-pl')
     >>> feature_structure('1pi', 'Nom')
-    ['Nom', '+1', '+2', '-3', '-sg', '+pl']
+    ('Nom', '+1', '+2', '-3', '-sg', '+pl')
 
     """
     first = '{}1'.format(value('1' in string))
@@ -42,14 +68,15 @@ def feature_structure(string, case, intr=False):
     sg = '{}sg'.format(value('s' in string))
     pl = '{}pl'.format(value('p' in string))
 
-    struct = [case, first, second, third, sg, pl]
+    struct = (case, first, second, third, sg, pl)
     if intr:
-        struct.append('+intr')
+        struct += ('+intr',)
     return struct
 
 
+@lru_cache(maxsize=None)
 def parse_features(string, ergative=False):
-    """Convert a person-number string into to a list of feature structures.
+    """Convert a person-number string into to a tuple of feature structures.
 
     Strings like 'EXT>INT' are considered transitive, whereas strings like 'ARG'
     are considered intranstive.
@@ -59,18 +86,18 @@ def parse_features(string, ergative=False):
      * Default: nominative-accusative alignment
 
     >>> parse_features('1s>3s')
-    [['Nom', '+1', '-2', '-3', '+sg', '-pl'], ['Acc', '-1', '-2', '+3', '+sg', '-pl']]
+    (('Nom', '+1', '-2', '-3', '+sg', '-pl'), ('Acc', '-1', '-2', '+3', '+sg', '-pl'))
     >>> parse_features('1di')
-    [['Nom', '+1', '+2', '-3', '-sg', '-pl', '+intr']]
+    (('Nom', '+1', '+2', '-3', '-sg', '-pl', '+intr'),)
 
      * Option: ergative-absolutive alignment
 
     >>> parse_features('1s>3s', ergative=True)
-    [['Erg', '+1', '-2', '-3', '+sg', '-pl'], ['Abs', '-1', '-2', '+3', '+sg', '-pl']]
+    (('Erg', '+1', '-2', '-3', '+sg', '-pl'), ('Abs', '-1', '-2', '+3', '+sg', '-pl'))
     >>> parse_features('1di', ergative=True)
-    [['Abs', '+1', '+2', '-3', '-sg', '-pl', '+intr']]
+    (('Abs', '+1', '+2', '-3', '-sg', '-pl', '+intr'),)
     >>> parse_features('')
-    []
+    ()
 
     """
     if ergative:
@@ -80,12 +107,27 @@ def parse_features(string, ergative=False):
         sarg = aarg = 'Nom'
         parg = 'Acc'
     if not string:
-        return list()
+        return tuple()
     args = string.split('>', 1)
     if len(args) == 1:
-        return [feature_structure(string.lower(), sarg, True)]
-    return [feature_structure(args[0].lower(), aarg),
-            feature_structure(args[1].lower(), parg)]
+        return (feature_structure(string.lower(), sarg, True),)
+    return (feature_structure(args[0].lower(), aarg),
+            feature_structure(args[1].lower(), parg))
+
+
+@lru_cache(maxsize=None)
+def parse_masks(string, ergative=False):
+    """Convert a person-number string into a tuple of feature masks.
+
+    >>> parse_masks('2p') == (
+    ...     feature_mask(['Nom', '-1', '+2', '-3', '-sg', '+pl', '+intr']),)
+    True
+    >>> parse_masks('')
+    ()
+
+    """
+    return tuple([feature_mask(fset)
+                  for fset in parse_features(string, ergative)])
 
 
 def bundle_to_str(features):
@@ -97,6 +139,128 @@ def feat_to_str(feature_sets):
     return '[{}]'.format(' '.join(map(bundle_to_str, feature_sets)))
 
 
+def feature_mask(features):
+    """Convert a feature structure into an integer bit mask.
+
+    Every feature in FEATURES has its own bit; other features are rejected.
+
+    >>> feature_mask(['Nom', '+1']) == NOM | FEATURE_BITS['+1']
+    True
+    >>> feature_mask([])
+    0
+    >>> feature_mask(['+4'])
+    Traceback (most recent call last):
+      ...
+    ValueError: unknown feature: '+4'
+
+    """
+    mask = 0
+    for feature in features:
+        try:
+            mask |= FEATURE_BITS[feature]
+        except KeyError:
+            raise ValueError('unknown feature: {!r}'.format(feature)) from None
+    return mask
+
+
+def subsumes_mask(cell_masks, morpheme_masks):
+    """Check if the feature masks of a vocabulary item subsume the feature
+    masks of a paradigm cell."""
+    for m in morpheme_masks:
+        for p in cell_masks:
+            if m & p == m:
+                break
+        else:
+            return False
+    return True
+
+
+def matching_vis(cell_masks, vi_matrix):
+    """Return the indices of all rows in a matrix of VI feature masks that
+    subsume the feature masks of a paradigm cell."""
+    indices = list()
+    for index, morpheme_masks in enumerate(vi_matrix):
+        for m in morpheme_masks:
+            for p in cell_masks:
+                if m & p == m:
+                    break
+            else:
+                break
+        else:
+            indices.append(index)
+    return indices
+
+
+def _contains(cell_masks, mask):
+    """Check if a feature mask is subsumed by any mask of a paradigm cell."""
+    for p in cell_masks:
+        if mask & p == mask:
+            return True
+    return False
+
+
+def _compile(name, arguments, body, result):
+    """Compile a generated function."""
+    lines = ['def {}({}):'.format(name, arguments)]
+    lines.extend(body)
+    lines.append('    return {}'.format(result))
+    namespace = {'_contains': _contains}
+    exec('\n'.join(lines), namespace)
+    return namespace[name]
+
+
+def compile_deletion(rule_contexts, rule_delete):
+    """Generate a function returning the features deleted in a paradigm cell.
+
+    The function takes a tuple of paradigm cell feature masks and returns the
+    union of the delete masks of all rules whose context subsumes the cell.
+    All masks are inlined as constants, and context feature structures with a
+    case feature are only compared to the arguments bearing that case.
+
+    >>> deletion = compile_deletion([[NOM | 0x100]], [0x200])
+    >>> deletion((NOM | 0x300,)), deletion((ACC | 0x300,))
+    (512, 0)
+
+    """
+    # group the cell masks by case once for all contexts with a case feature;
+    # rules never delete features from their contexts, so this is safe
+    cases = sorted({mask & CASE_MASK & -(mask & CASE_MASK)
+                    for context in rule_contexts for mask in context} - {0})
+    body = ['    case_{0:x} = [p for p in cell_masks if p & {0:#x}]'
+            .format(case) for case in cases]
+    body.append('    delete = 0')
+    for context, delete in zip(rule_contexts, rule_delete):
+        conditions = list()
+        for mask in context:
+            case = mask & CASE_MASK & -(mask & CASE_MASK)
+            candidates = 'case_{:x}'.format(case) if case else 'cell_masks'
+            conditions.append('_contains({}, {:#x})'.format(candidates, mask))
+        body.append('    if {}:'.format(' and '.join(conditions or ['True'])))
+        body.append('        delete |= {:#x}'.format(delete))
+    return _compile('deletion', 'cell_masks', body, 'delete')
+
+
+def compile_matcher(vi_matrix):
+    """Generate a function returning the VIs that match a paradigm cell.
+
+    The function takes a tuple of paradigm cell feature masks and the mask of
+    features not deleted by any rule, and returns the indices of the rows of
+    `vi_matrix` that subsume the cell once the deleted features are removed.
+
+    >>> matcher = compile_matcher([[NOM | 0x100], [0x200]])
+    >>> matcher((NOM | 0x300,), ~0), matcher((ACC | 0x100,), ~NOM)
+    ([0, 1], [0])
+
+    """
+    body = ['    indices = []']
+    for index, masks in enumerate(vi_matrix):
+        body.append('    if {}:'.format(' and '.join(
+            ['_contains(cell_masks, {:#x} & keep)'.format(mask)
+             for mask in masks] or ['True'])))
+        body.append('        indices.append({})'.format(index))
+    return _compile('matcher', 'cell_masks, keep', body, 'indices')
+
+
 def subsumes(paradigm_cell, morpheme):
     """Check if a vocabulary item subsumes the features in a paradigm cell.
 
@@ -116,32 +280,32 @@ def subsumes(paradigm_cell, morpheme):
     True
 
     """
-    for mstruct in morpheme:
-        if not any(set(mstruct) <= set(pstruct) for pstruct in paradigm_cell):
-            return False
-    return True
+    return subsumes_mask([feature_mask(pstruct) for pstruct in paradigm_cell],
+                         [feature_mask(mstruct) for mstruct in morpheme])
 
 
 def make_row(row, lens):
-    """Create a single row for an ascii table."""
-    cells = ('{row:<{len}}'.format(row=str(row[i]), len=lens[i])
-             for i in range(len(row)))
+    """Create a single row for an ascii table from a row of strings."""
+    cells = ('{row:<{len}}'.format(row=cell, len=length)
+             for cell, length in zip(row, lens))
     return '  {0}  '.format('  '.join(cells))
 
 
 def make_table(array):
     """Create an ascii table from an array."""
-    width = len(array[0])
-    height = len(array)
-    lens = [max(len(array[row][col]) for row in range(height))
-            for col in range(width)]
-    head = make_row(array[0], lens)
+    str_array = [[str(cell) for cell in row] for row in array]
+    lens = [0] * len(str_array[0])
+    for row in str_array:
+        for col, cell in enumerate(row):
+            if len(cell) > lens[col]:
+                lens[col] = len(cell)
+    head = make_row(str_array[0], lens)
     dline = '=' * (len(head))
     sline = '-' * (len(head))
     table = [dline, head]
-    if len(array) > 1:
+    if len(str_array) > 1:
         table.append(sline)
-        table.extend(make_row(row, lens) for row in array[1:])
+        table.extend(make_row(row, lens) for row in str_array[1:])
     table.append(dline)
     return '\n'.join(table)
 
@@ -155,17 +319,53 @@ class VI(object):
         self.form = form
         self.meaning = meaning
 
+    @property
+    def meaning(self):
+        """Morpho-syntactic features that have not been deleted yet.
+
+        The features are returned as a tuple of tuples; assign a new meaning
+        to change them.
+
+        >>> vi = VI('-s', [['+3', '+sg']])
+        >>> vi.del_features(['+sg'])
+        >>> vi.meaning
+        (('+3',),)
+
+        """
+        return tuple(
+            tuple([feature for feature in fset
+                   if FEATURE_BITS[feature] & mask])
+            for fset, mask in zip(self._meaning, self.meaning_masks))
+
+    @meaning.setter
+    def meaning(self, meaning):
+        self._meaning = tuple(tuple(fset) for fset in meaning)
+        self.meaning_masks = [feature_mask(fset) for fset in self._meaning]
+
     def __str__(self):
         """Return string representation of the VI."""
         return '/{phon}/: {cat}'.format(
             phon=self.form,
             cat=feat_to_str(self.meaning))
 
+    def clone(self):
+        """Return a copy of the VI that can be changed independently."""
+        new = object.__new__(type(self))
+        new.form = self.form
+        new._meaning = self._meaning
+        new.meaning_masks = list(self.meaning_masks)
+        return new
+
     def del_features(self, features, leftovers=None):
         """Delete features from the Vocabulary Item."""
-        dset = set(features)
-        self.meaning = [[feature for feature in fset if not feature in dset]
-                        for fset in self.meaning]
+        self.del_mask(feature_mask(features))
+
+    def del_mask(self, delete_mask):
+        """Delete the features in a feature mask from the Vocabulary Item."""
+        keep = ~delete_mask
+        masks = self.meaning_masks
+        for index in range(len(masks)):
+            masks[index] &= keep
 
 
 class GenRule(object):
@@ -177,6 +377,34 @@ class GenRule(object):
         self.features = features
         self.context = context
 
+    @property
+    def features(self):
+        """Features deleted by the rule.
+
+        >>> rule = GenRule(['+pl'], [['+1']])
+        >>> rule.features = ['+sg']
+        >>> rule.delete_mask == FEATURE_BITS['+sg']
+        True
+
+        """
+        return self._features
+
+    @features.setter
+    def features(self, features):
+        self._features = tuple(features)
+        self.delete_mask = feature_mask(self._features)
+
+    @property
+    def context(self):
+        """Feature structures the paradigm cell must contain for the rule to
+        apply."""
+        return self._context
+
+    @context.setter
+    def context(self, context):
+        self._context = tuple(tuple(fset) for fset in context)
+        self.context_masks = [feature_mask(fset) for fset in self._context]
+
     def __str__(self):
         """Return string representation of a generalisation rule."""
         return '{features} \u2192 \u2205 / {context}'.format(
@@ -186,7 +414,7 @@ class GenRule(object):
     def apply(self, morpheme_list):
         """Apply the generalisation rule to a vocabulary item."""
         for morpheme in morpheme_list:
-            morpheme.del_features(self.features, self.leftovers)
+            morpheme.del_mask(self.delete_mask)
 
 
 class Language(object):
@@ -196,15 +424,50 @@ class Language(object):
                  transitive=False, ergative=False):
         """Create a language.
 
-        morphemes:  List of vocabulary items of the language
-        rules:      List of generalisation rules for the language
+        morphemes:  Vocabulary items of the language (stored as a tuple)
+        rules:      Generalisation rules for the language (stored as a tuple)
 
         dual:       Set to True if the language distinguishes dual
         inclusive:  Set to True if the language distinguishes 1st person incl.
         transitive: Set to True if the language shows object agreement
         ergative:   Set to True if the language uses Erg/Abs; False for Nom/Acc.
 
+        Realised paradigm cells are cached by the features the applicable
+        rules delete in them, so after a change of rules only cells whose
+        deletions changed are matched against the VIs again.  `morphemes` and
+        `rules` are stored as tuples; the caches are updated whenever either
+        is reassigned or a rule is added via `add_rule`.  After changing a VI
+        or rule in-place, call `invalidate` to reset them manually.
+
+        >>> lang = Language([VI('a-', [['Nom', '+1', '+sg']]),
+        ...                  VI('-b', [['+pl']])])
+        >>> [vi.form for vi in lang.realise_cell(parse_features('1p'))]
+        ['-b']
+        >>> lang.add_rule(GenRule(['+sg'], [['+1']]))
+        >>> [vi.form for vi in lang.realise_cell(parse_features('1p'))]
+        ['a-', '-b']
+        >>> lang.rules = []
+        >>> [vi.form for vi in lang.realise_cell(parse_features('1p'))]
+        ['-b']
+        >>> lang.rules.append(GenRule(['+1'], [['+1']]))
+        Traceback (most recent call last):
+          ...
+        AttributeError: 'tuple' object has no attribute 'append'
+
+        Cells not affected by a new rule keep their realisation:
+
+        >>> third = lang.realise_cell(parse_features('3p'))
+        >>> lang.add_rule(GenRule(['+sg'], [['+1']]))
+        >>> lang.realise_cell(parse_features('3p'))[0] is third[0]
+        True
+
         """
+        self._shell = None
+        self._vi_packed = None
+        self._reduced = dict()
+        self._realise_cache = dict()
+        self._rule_packed = None
+        self._deletions = dict()
         self.morphemes = morphemes if morphemes is not None else list()
         self.rules = rules if rules is not None else list()
         self.dual = dual
@@ -212,86 +475,298 @@ class Language(object):
         self.transitive = transitive
         self.ergative = ergative
 
+    @property
+    def morphemes(self):
+        """Tuple of vocabulary items of the language."""
+        return self._morphemes
+
+    @morphemes.setter
+    def morphemes(self, morphemes):
+        self._morphemes = tuple(morphemes)
+        self._reset_morphemes()
+
+    @property
+    def rules(self):
+        """Tuple of generalisation rules of the language."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules):
+        self._rules = tuple(rules)
+        self._reset_rules()
+
+    def add_rule(self, rule):
+        """Add a generalisation rule to the language."""
+        self._rules += (rule,)
+        self._reset_rules()
+
+    def _reset_morphemes(self):
+        """Reset everything cached for the vocabulary items."""
+        self._vi_packed = None
+        self._reduced.clear()
+        self._realise_cache.clear()
+
+    def _reset_rules(self):
+        """Reset everything cached for the generalisation rules."""
+        self._rule_packed = None
+        self._deletions.clear()
+
+    def invalidate(self):
+        """Reset the masks and realisations cached for morphemes and rules.
+
+        Reassigning `morphemes` resets the VI half of this, so that the new
+        VIs are inserted even if their content is the same as that of the old
+        ones:
+
+        >>> lang = Language([VI('a-', [['+1']])])
+        >>> old = lang.realise_cell(parse_features('1s'))[0]
+        >>> lang.morphemes = [VI('a-', [['+1']])]
+        >>> lang.realise_cell(parse_features('1s'))[0] is lang.morphemes[0]
+        True
+
+        """
+        self._reset_morphemes()
+        self._reset_rules()
+
+    def _pack_morphemes(self):
+        """Return the meaning masks of all VIs and the generated matcher."""
+        if self._vi_packed is None:
+            vi_matrix = [list(vi.meaning_masks) for vi in self._morphemes]
+            self._vi_packed = (vi_matrix, compile_matcher(vi_matrix))
+        return self._vi_packed
+
+    def _pack_rules(self):
+        """Return the context and delete masks of all rules and the generated
+        deletion function."""
+        if self._rule_packed is None:
+            rule_contexts = [list(rule.context_masks) for rule in self._rules]
+            rule_delete = [rule.delete_mask for rule in self._rules]
+            self._rule_packed = (
+                rule_contexts, rule_delete,
+                compile_deletion(rule_contexts, rule_delete))
+        return self._rule_packed
+
+    def pack(self):
+        """Return the feature masks of vocabulary items and rules.
+
+        The result is a triple of parallel arrays: the meaning masks of each
+        VI, the context masks of each rule and the delete mask of each rule.
+
+        """
+        rule_contexts, rule_delete, _ = self._pack_rules()
+        return self._pack_morphemes()[0], rule_contexts, rule_delete
+
+    def _deletion(self, cell_masks):
+        """Return the features deleted by all rules applying to a cell."""
+        # rule contexts are matched against the cell (not the VIs), so the
+        # features deleted by all applicable rules can be removed in one go
+        rule_contexts, rule_delete, _ = self._pack_rules()
+        delete = 0
+        for context, rule_mask in zip(rule_contexts, rule_delete):
+            if subsumes_mask(cell_masks, context):
+                delete |= rule_mask
+        return delete
+
+    def _reduce(self, delete):
+        """Return the VI masks and VIs after deleting a set of features.
+
+        VIs with reduced meanings are shared by all cells to which the same
+        rules apply.
+
+        """
+        reduced = self._reduced.get(delete)
+        if reduced is None:
+            vi_matrix = self._pack_morphemes()[0]
+            if delete:
+                vis = [vi.clone() for vi in self.morphemes]
+                for vi in vis:
+                    vi.del_mask(delete)
+                working = [vi.meaning_masks for vi in vis]
+            else:
+                working = vi_matrix
+                vis = list(self.morphemes)
+            reduced = self._reduced[delete] = (working, vis)
+        return reduced
+
+    def _cell_deletion(self, cell_masks):
+        """Return the (cached) features deleted by the rules in a cell."""
+        delete = self._deletions.get(cell_masks)
+        if delete is None:
+            delete = self._deletions[cell_masks] = (
+                self._pack_rules()[2](cell_masks))
+        return delete
+
+    def _insertable(self, cell_masks):
+        """Return the (cached) list of VIs inserted into a paradigm cell."""
+        delete = self._cell_deletion(cell_masks)
+        insertable = self._realise_cache.get((delete, cell_masks))
+        if insertable is None:
+            vis = self._reduce(delete)[1]
+            indices = self._pack_morphemes()[1](cell_masks, ~delete)
+            insertable = [vis[i] for i in indices]
+            self._realise_cache[delete, cell_masks] = insertable
+        return insertable
+
     def realise_cell(self, cell, verbose=False):
         """Insert a vi into a paradigm cell"""
-        if verbose:
-            print('Paradigm cell:', feat_to_str(cell))
-            input()
+        cell_masks = tuple([feature_mask(fset) for fset in cell])
+        if not verbose:
+            return self.realise_cell_by_mask(cell_masks)
+
+        print('Paradigm cell:', feat_to_str(cell))
+        input()
 
         # step one: copy
-        morphemes = deepcopy(self.morphemes)
-        if verbose:
-            print(' 1. Creating copy of the morpheme list')
-            for index, vi in enumerate(morphemes):
-                print('    %c. %s' % (chr(ord('a') + index), str(vi)))
-            input()
+        print(' 1. Creating copy of the morpheme list')
+        for index, vi in enumerate(self.morphemes):
+            print('    %c. %s' % (chr(ord('a') + index), str(vi)))
+        input()
 
         # step two: apply generalisation rules
-        if verbose:
-            print(' 2. Applying rules')
+        print(' 2. Applying rules')
         for index, rule in enumerate(self.rules):
-            if verbose:
-                print('    %c. %s' % (chr(ord('a') + index), str(rule)))
-            if subsumes(cell, rule.context):
-                rule.apply(morphemes)
-        if verbose:
-            print()
-            print('    new VI list')
-            for index, vi in enumerate(morphemes):
-                print('    %c. %s' % (chr(ord('a') + index), str(vi)))
-            input()
+            print('    %c. %s' % (chr(ord('a') + index), str(rule)))
+        working, morphemes = self._reduce(self._deletion(cell_masks))
+        print()
+        print('    new VI list')
+        for index, vi in enumerate(morphemes):
+            print('    %c. %s' % (chr(ord('a') + index), str(vi)))
+        input()
 
         # step three: find matching vis for the paradigm cell
-        if verbose:
-            print(' 3. Finding Vocabulary Items')
-        insertable = [vi for vi in morphemes if subsumes(cell, vi.meaning)]
-        if verbose:
-            for index, vi in enumerate(insertable):
-                print('    %c. %s' % (chr(ord('a') + index), vi))
-            input()
+        print(' 3. Finding Vocabulary Items')
+        insertable = [morphemes[i] for i in matching_vis(cell_masks, working)]
+        for index, vi in enumerate(insertable):
+            print('    %c. %s' % (chr(ord('a') + index), vi))
+        input()
         return insertable
 
+    def realise_cell_by_mask(self, cell_masks):
+        """Insert a vi into a paradigm cell given as a tuple of masks.
+
+        >>> lang = Language([VI('a-', [['Nom', '+1']]), VI('-0', [])])
+        >>> [vi.form for vi in lang.realise_cell_by_mask(parse_masks('1s'))]
+        ['a-', '-0']
+        >>> [vi.form for vi in lang.realise_cell_by_mask(parse_masks(''))]
+        ['-0']
+        >>> Language().realise_cell_by_mask(parse_masks('1s'))
+        []
+
+        """
+        if not self.morphemes:
+            return list()
+        if not cell_masks:
+            # only VIs without any feature structure subsume an empty cell
+            return [vi for vi in self.morphemes if not vi.meaning_masks]
+        return list(self._insertable(cell_masks))
+
+    def realise_paradigm(self, mask_table):
+        """Insert vis into every cell of a table of paradigm cell masks.
+
+        Uncached cells are grouped by the features the applicable rules delete
+        in them, so the VIs with reduced meanings are looked up once per group.
+
+        >>> lang = Language([VI('a-', [['+1']]), VI('-b', [['Acc']])],
+        ...                 [GenRule(['Acc'], [['+2']])], transitive=True)
+        >>> table = [[parse_masks('1s'), parse_masks('1s>2s'), parse_masks('')]]
+        >>> [[''.join(vi.form for vi in cell) for cell in row]
+        ...  for row in lang.realise_paradigm(table)]
+        [['a-', 'a--b', '']]
+
+        """
+        paradigm = list()
+        groups = dict()
+        for row in mask_table:
+            realised = list()
+            for cell_masks in row:
+                if not self.morphemes or not cell_masks:
+                    realised.append(self.realise_cell_by_mask(cell_masks))
+                    continue
+                delete = self._cell_deletion(cell_masks)
+                insertable = self._realise_cache.get((delete, cell_masks))
+                if insertable is None:
+                    groups.setdefault(delete, []).append(
+                        (realised, len(realised), cell_masks))
+                    realised.append(None)
+                else:
+                    realised.append(list(insertable))
+            paradigm.append(realised)
+        if groups:
+            matcher = self._pack_morphemes()[1]
+        for delete, cells in groups.items():
+            vis = self._reduce(delete)[1]
+            keep = ~delete
+            for realised, col, cell_masks in cells:
+                insertable = [vis[i] for i in matcher(cell_masks, keep)]
+                self._realise_cache[delete, cell_masks] = insertable
+                realised[col] = list(insertable)
+        return paradigm
+
     def show_derivation(self, feature_string):
         """Show derivation of a single paradigm cell."""
         self.realise_cell(
             parse_features(feature_string, self.ergative),
             verbose=True)
 
-    def draw_paradigm(self):
-        """Print the complete paradigm of a language."""
+    def _paradigm_shell(self):
+        """Return the subjects and cell feature masks of the paradigm.
+
+        The result is built on first use and rebuilt whenever `dual`,
+        `inclusive`, `transitive` or `ergative` has changed since.  Its last
+        item is the value of `transitive` it was built for.
+
+        """
+        key = (self.dual, self.inclusive, self.transitive, self.ergative)
+        if self._shell is not None and self._shell[0] == key:
+            return self._shell[1]
         persons = ['1', '1i', '2', '3']
         if not self.inclusive:
             del persons[1]
         numbers = ['s', 'd', 'p']
         if not self.dual:
             del numbers[1]
-        subjects = ['%s%s' % (pers, num) for pers in persons for num in numbers
-                    if not (pers == '1i' and num == 's')]
+        cells = [('%s%s' % (pers, num), PERSON_MASKS[pers])
+                 for pers in persons for num in numbers
+                 if not (pers == '1i' and num == 's')]
+        subjects = [subj for subj, _ in cells]
         if self.transitive:
-            objects = subjects[::]
+            # arguments clash if they share the speaker or the hearer
             pntable = list()
-            for subj in subjects:
+            for subj, subj_mask in cells:
                 row = [subj]
-                for obj in objects:
-                    if any(('1' in subj and '1' in obj,
-                            '2' in subj and '2' in obj,
-                            '2' in subj and 'i' in obj,
-                            'i' in subj and '2' in obj)):
+                for obj, obj_mask in cells:
+                    if subj_mask & obj_mask:
                         row.append('')
                     else:
                         row.append('%s>%s' % (subj, obj))
                 pntable.append(row)
         else:
             pntable = [[subj] for subj in subjects]
-        paradigm = [
-            [self.realise_cell(parse_features(cell, self.ergative))
-             for cell in row]
-            for row in pntable]
+        mask_table = [[parse_masks(cell, self.ergative) for cell in row]
+                      for row in pntable]
+        shell = (subjects, mask_table, self.transitive)
+        self._shell = (key, shell)
+        return shell
+
+    def draw_paradigm(self):
+        """Print the complete paradigm of a language."""
+        subjects, mask_table, transitive = self._paradigm_shell()
+        paradigm = self.realise_paradigm(mask_table)
+        # cells realised by the same VIs share their (cached) VI objects, so
+        # their forms only need to be concatenated once
+        forms = dict()
+
+        def form(cell):
+            key = tuple([id(vi) for vi in cell])
+            string = forms.get(key)
+            if string is None:
+                string = forms[key] = ''.join(vi.form for vi in cell)
+            return string
+
         table = [['', 'intr']]
-        if self.transitive:
+        if transitive:
             table[0].extend(subjects)
-        table.extend([[subjects[i]] + [''.join(vi.form for vi in cell)
-                                    for cell in row]
+        table.extend([[subjects[i]] + [form(cell) for cell in row]
                     for i, row in enumerate(paradigm)])
         print(make_table(table))
 